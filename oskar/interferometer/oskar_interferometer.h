@@ -50,6 +50,10 @@ struct oskar_Interferometer;
 typedef struct oskar_Interferometer oskar_Interferometer;
 #endif
 
+OSKAR_EXPORT
+void oskar_interferometer_bind_thread_to_device(
+        const oskar_Interferometer* h, int device_id);
+
 OSKAR_EXPORT
 void oskar_interferometer_check_init(oskar_Interferometer* h, int* status);
 
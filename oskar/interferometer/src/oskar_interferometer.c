@@ -147,6 +147,15 @@ static void system_mem_log(oskar_Log* log);
 
 /* Public methods. */
 
+void oskar_interferometer_bind_thread_to_device(
+        const oskar_Interferometer* h, int device_id)
+{
+    /* Keep host-side work for a GPU on the CPU cores closest to it. */
+    if (device_id >= 0 && device_id < h->num_gpus)
+        oskar_device_set_thread_affinity(h->gpu_ids[device_id]);
+}
+
+
 void oskar_interferometer_check_init(oskar_Interferometer* h, int* status)
 {
     if (*status) return;
@@ -237,7 +246,11 @@ oskar_VisBlock* oskar_interferometer_finalise_block(oskar_Interferometer* h,
     if (*status) return 0;
 
     /* The visibilities must be copied back
-     * at the end of the block simulation. */
+     * at the end of the block simulation.
+     * Each device copies its output into one of two host buffers, selected
+     * by the block index, so the next block can be simulated on the device
+     * while this one is finalised. The combined block is therefore only
+     * valid until block (block_index + 2) is simulated. */
 
     /* Combine all vis blocks into the first one. */
     i_active = (block_index + 1) % 2;
@@ -360,7 +373,7 @@ void oskar_interferometer_reset_cache(oskar_Interferometer* h, int* status)
 
 void oskar_interferometer_reset_work_unit_index(oskar_Interferometer* h)
 {
-    h->work_unit_index = 0;
+    oskar_atomic_store(&h->work_unit_index, 0);
 }
 
 
@@ -416,9 +429,7 @@ void oskar_interferometer_run_block(oskar_Interferometer* h, int block_index,
         oskar_Sky* sky;
         int i_work_unit, i_chunk, i_time, i_channel, sim_time_idx;
 
-        oskar_mutex_lock(h->mutex);
-        i_work_unit = (h->work_unit_index)++;
-        oskar_mutex_unlock(h->mutex);
+        i_work_unit = oskar_atomic_fetch_add(&h->work_unit_index, 1);
         if ((i_work_unit >= num_times_block * total_chunks) || *status) break;
 
         /* Convert slice index to chunk/time index. */
@@ -500,6 +511,10 @@ static void* run_blocks(void* arg)
     omp_set_num_threads(1);
 #endif
 
+    /* Bind compute threads to the CPU cores local to their device. */
+    if (thread_id > 0)
+        oskar_interferometer_bind_thread_to_device(h, device_id);
+
     /* Loop over blocks of observation time, running simulation and file
      * writing one block at a time. Simulation and file output are overlapped
      * by using double buffering, and a dedicated thread is used for file
@@ -720,11 +735,18 @@ void oskar_interferometer_set_force_polarised_ms(oskar_Interferometer* h,
 void oskar_interferometer_set_gpus(oskar_Interferometer* h, int num,
         const int* ids, int* status)
 {
-    int i, num_gpus_avail;
+    int i, num_gpus_avail, unchanged;
     if (*status || !h) return;
-    free_device_data(h, status);
     num_gpus_avail = oskar_device_count(status);
     if (*status) return;
+
+    /* Keep any device data if the GPUs to use are unchanged. */
+    unchanged = ((num < 0 ? num_gpus_avail : num) == h->num_gpus);
+    for (i = 0; unchanged && i < h->num_gpus; ++i)
+        unchanged = (h->gpu_ids[i] == (num < 0 ? i : ids[i]));
+    if (unchanged) return;
+    free_device_data(h, status);
+    if (*status) return;
     if (num < 0)
     {
         h->num_gpus = num_gpus_avail;
@@ -788,10 +810,13 @@ void oskar_interferometer_set_max_times_per_block(oskar_Interferometer* h,
 void oskar_interferometer_set_num_devices(oskar_Interferometer* h, int value)
 {
     int status = 0;
-    free_device_data(h, &status);
     if (value < 1)
         value = (h->num_gpus == 0) ? (oskar_get_num_procs() - 1) : h->num_gpus;
     if (value < 1) value = 1;
+
+    /* Keep any device data if the number of devices is unchanged. */
+    if (value == h->num_devices && h->d) return;
+    free_device_data(h, &status);
     h->num_devices = value;
     h->d = (DeviceData*) realloc(h->d, h->num_devices * sizeof(DeviceData));
     memset(h->d, 0, h->num_devices * sizeof(DeviceData));
@@ -116,6 +116,27 @@ void oskar_device_reset(void);
 OSKAR_EXPORT
 void oskar_device_set(int id, int* status);
 
+/**
+ * @brief
+ * Binds the calling thread to the CPU cores local to a device.
+ *
+ * @details
+ * Sets the CPU affinity of the calling thread to the set of CPU cores
+ * attached to the same NUMA node as the specified device, so that
+ * host-side work and memory transfers for the device do not have to cross
+ * the inter-socket link.
+ * The existing affinity of the thread is respected, so only cores that
+ * the thread may already run on are used. If none of them are local to
+ * the device, the affinity is not changed.
+ *
+ * This is only supported on Linux if CUDA is available; otherwise, or if
+ * the CPU topology cannot be determined, this function does nothing.
+ *
+ * @param[in] id          CUDA device ID.
+ */
+OSKAR_EXPORT
+void oskar_device_set_thread_affinity(int id);
+
 /**
  * @brief
  * Synchronises the current device.
@@ -90,6 +90,45 @@ void oskar_mutex_lock(oskar_Mutex* mutex);
 OSKAR_EXPORT
 void oskar_mutex_unlock(oskar_Mutex* mutex);
 
+/**
+ * @brief Atomically adds to an integer.
+ *
+ * @details
+ * Atomically adds \p increment to the integer pointed to by \p value,
+ * and returns the value it held previously.
+ *
+ * This is lock-free on all supported compilers, and falls back to
+ * using a mutex otherwise.
+ *
+ * @param[in,out] value     Pointer to integer to modify.
+ * @param[in] increment     Value to add.
+ */
+OSKAR_EXPORT
+int oskar_atomic_fetch_add(volatile int* value, int increment);
+
+/**
+ * @brief Atomically reads an integer.
+ *
+ * @details
+ * Atomically reads the integer pointed to by \p value.
+ *
+ * @param[in] value     Pointer to integer to read.
+ */
+OSKAR_EXPORT
+int oskar_atomic_load(volatile int* value);
+
+/**
+ * @brief Atomically sets an integer.
+ *
+ * @details
+ * Atomically sets the integer pointed to by \p value to \p new_value.
+ *
+ * @param[in,out] value     Pointer to integer to modify.
+ * @param[in] new_value     Value to set.
+ */
+OSKAR_EXPORT
+void oskar_atomic_store(volatile int* value, int new_value);
+
 /**
  * @brief Creates and starts a thread.
  *
@@ -152,6 +191,23 @@ void oskar_barrier_free(oskar_Barrier* barrier);
 OSKAR_EXPORT
 void oskar_barrier_set_num_threads(oskar_Barrier* barrier, int num_threads);
 
+/**
+ * @brief Sets the number of times to poll the barrier before blocking.
+ *
+ * @details
+ * Sets the number of times a waiting thread polls the barrier before
+ * blocking on it. Spinning avoids the latency of waking a blocked thread,
+ * which can be significant if the work between barriers is very short,
+ * but it should only be used if each thread has its own CPU core.
+ *
+ * The default is 0, so that waiting threads block immediately.
+ *
+ * @param[in,out] barrier    Pointer to barrier.
+ * @param[in] spin_count     Number of times to poll before blocking.
+ */
+OSKAR_EXPORT
+void oskar_barrier_set_spin_count(oskar_Barrier* barrier, int spin_count);
+
 /**
  * @brief Make all threads wait at the barrier.
  *
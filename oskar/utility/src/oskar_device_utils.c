@@ -26,7 +26,13 @@
  * POSSIBILITY OF SUCH DAMAGE.
  */
 
+#if defined(__linux__) && !defined(_GNU_SOURCE)
+#define _GNU_SOURCE /* For sched_setaffinity(). */
+#endif
+
 #include "utility/oskar_device_utils.h"
+#include <ctype.h>
+#include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
 
@@ -34,6 +40,10 @@
 #include <cuda_runtime_api.h>
 #endif
 
+#if defined(OSKAR_HAVE_CUDA) && defined(__linux__)
+#include <sched.h>
+#endif
+
 #ifdef __cplusplus
 extern "C" {
 #endif
@@ -120,6 +130,61 @@ void oskar_device_set(int id, int* status)
 }
 
 
+void oskar_device_set_thread_affinity(int id)
+{
+#if defined(OSKAR_HAVE_CUDA) && defined(__linux__)
+    char bus_id[32], path[128], list[1024], *p, *end;
+    long first, last;
+    cpu_set_t cpus, allowed;
+    FILE* file;
+    if (id < 0) return;
+    if (cudaDeviceGetPCIBusId(bus_id, (int) sizeof(bus_id), id) != cudaSuccess)
+        return;
+
+    /* The PCI domain is padded to 4 digits in sysfs, but may be reported
+     * with 8 digits, and sysfs uses lower case. */
+    p = strchr(bus_id, ':');
+    if (!p) return;
+    p = (p - bus_id > 4) ? p - 4 : bus_id;
+    for (end = p; *end; ++end) *end = (char) tolower(*end);
+    sprintf(path, "/sys/bus/pci/devices/%.16s/local_cpulist", p);
+
+    /* Read the list of local CPUs, in the form "0-7,16-23". */
+    file = fopen(path, "r");
+    if (!file) return;
+    p = fgets(list, (int) sizeof(list), file);
+    fclose(file);
+    if (!p) return;
+    CPU_ZERO(&cpus);
+    for (;;)
+    {
+        first = strtol(p, &end, 10);
+        if (end == p) break;
+        last = first;
+        if (*end == '-')
+        {
+            p = end + 1;
+            last = strtol(p, &end, 10);
+            if (end == p) break;
+        }
+        for (; first <= last && first < CPU_SETSIZE; ++first)
+            CPU_SET((int) first, &cpus);
+        if (*end != ',') break;
+        p = end + 1;
+    }
+
+    /* Keep any binding already applied to the thread, for example by
+     * taskset or an MPI launcher, and use only the local CPUs within it. */
+    if (sched_getaffinity(0, sizeof(cpu_set_t), &allowed) != 0) return;
+    CPU_AND(&cpus, &cpus, &allowed);
+    if (CPU_COUNT(&cpus) > 0)
+        sched_setaffinity(0, sizeof(cpu_set_t), &cpus);
+#else
+    (void) id;
+#endif
+}
+
+
 void oskar_device_synchronize(void)
 {
 #ifdef OSKAR_HAVE_CUDA
@@ -171,6 +171,67 @@ static void oskar_condition_wait(oskar_ConditionVar* var)
 }
 
 
+/* =========================================================================
+ *  ATOMIC
+ * =========================================================================*/
+
+#if !defined(OSKAR_OS_WIN) && !defined(__GNUC__)
+static pthread_mutex_t atomic_lock = PTHREAD_MUTEX_INITIALIZER;
+#endif
+
+int oskar_atomic_fetch_add(volatile int* value, int increment)
+{
+#if defined(OSKAR_OS_WIN)
+    return (int) InterlockedExchangeAdd((volatile LONG*) value,
+            (LONG) increment);
+#elif defined(__ATOMIC_SEQ_CST)
+    return __atomic_fetch_add(value, increment, __ATOMIC_SEQ_CST);
+#elif defined(__GNUC__)
+    return __sync_fetch_and_add(value, increment);
+#else
+    int old_value;
+    pthread_mutex_lock(&atomic_lock);
+    old_value = *value;
+    *value += increment;
+    pthread_mutex_unlock(&atomic_lock);
+    return old_value;
+#endif
+}
+
+int oskar_atomic_load(volatile int* value)
+{
+#if defined(OSKAR_OS_WIN)
+    return (int) InterlockedCompareExchange((volatile LONG*) value, 0, 0);
+#elif defined(__ATOMIC_SEQ_CST)
+    return __atomic_load_n(value, __ATOMIC_SEQ_CST);
+#elif defined(__GNUC__)
+    return __sync_fetch_and_add(value, 0);
+#else
+    int current_value;
+    pthread_mutex_lock(&atomic_lock);
+    current_value = *value;
+    pthread_mutex_unlock(&atomic_lock);
+    return current_value;
+#endif
+}
+
+void oskar_atomic_store(volatile int* value, int new_value)
+{
+#if defined(OSKAR_OS_WIN)
+    InterlockedExchange((volatile LONG*) value, (LONG) new_value);
+#elif defined(__ATOMIC_SEQ_CST)
+    __atomic_store_n(value, new_value, __ATOMIC_SEQ_CST);
+#elif defined(__GNUC__)
+    __sync_lock_test_and_set(value, new_value);
+    __sync_synchronize();
+#else
+    pthread_mutex_lock(&atomic_lock);
+    *value = new_value;
+    pthread_mutex_unlock(&atomic_lock);
+#endif
+}
+
+
 /* =========================================================================
  *  THREAD
  * =========================================================================*/
@@ -251,7 +312,8 @@ void oskar_thread_join(oskar_Thread* thread)
 struct oskar_Barrier
 {
     oskar_ConditionVar var;
-    unsigned int num_threads, count, iter;
+    unsigned int num_threads, count;
+    int iter, spin_count;
 };
 
 oskar_Barrier* oskar_barrier_create(int num_threads)
@@ -279,24 +341,38 @@ void oskar_barrier_set_num_threads(oskar_Barrier* barrier, int num_threads)
     barrier->iter = 0;
 }
 
+void oskar_barrier_set_spin_count(oskar_Barrier* barrier, int spin_count)
+{
+    barrier->spin_count = spin_count;
+}
+
 int oskar_barrier_wait(oskar_Barrier* barrier)
 {
     oskar_condition_lock(&barrier->var);
     {
-        const unsigned int i = barrier->iter;
+        const int i = barrier->iter;
         if (--(barrier->count) == 0)
         {
-            (barrier->iter)++;
+            oskar_atomic_fetch_add(&barrier->iter, 1);
             barrier->count = barrier->num_threads;
             oskar_condition_notify_all(&barrier->var);
             oskar_condition_unlock(&barrier->var);
             return 1;
         }
+        /* Poll the barrier without the lock before blocking, if required. */
+        if (barrier->spin_count > 0)
+        {
+            int spin;
+            oskar_condition_unlock(&barrier->var);
+            for (spin = 0; spin < barrier->spin_count; ++spin)
+                if (oskar_atomic_load(&barrier->iter) != i) return 0;
+            oskar_condition_lock(&barrier->var);
+        }
         /* Release lock and block this thread until notified/woken. */
-        /* Allow for spurious wake-ups. */
-        do {
+        /* Allow for spurious wake-ups, and for the barrier having been
+         * released while spinning. */
+        while (i == barrier->iter)
             oskar_condition_wait(&barrier->var);
-        } while (i == barrier->iter);
     }
     oskar_condition_unlock(&barrier->var);
     return 0;
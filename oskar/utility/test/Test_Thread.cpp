@@ -51,6 +51,7 @@ struct ThreadArgs
 {
     int thread_id;
     oskar_Barrier* barrier;
+    volatile int *counter, *errors;
 };
 typedef struct ThreadArgs ThreadArgs;
 
@@ -68,6 +69,37 @@ void* thread_barriers(void* arg)
     return 0;
 }
 
+void* thread_spin_barriers(void* arg)
+{
+    ThreadArgs* args = (ThreadArgs*) arg;
+    for (int i = 0; i < 1000; ++i)
+    {
+        // Every thread must see the same counter value between barriers.
+        if (args->thread_id == 0)
+            oskar_atomic_store(args->counter, i);
+        oskar_barrier_wait(args->barrier);
+        if (oskar_atomic_load(args->counter) != i)
+            oskar_atomic_fetch_add(args->errors, 1);
+        oskar_barrier_wait(args->barrier);
+    }
+    return 0;
+}
+
+struct AtomicArgs
+{
+    int num_loops;
+    volatile int* counter;
+};
+typedef struct AtomicArgs AtomicArgs;
+
+void* thread_atomic(void* arg)
+{
+    AtomicArgs* args = (AtomicArgs*) arg;
+    for (int i = 0; i < args->num_loops; ++i)
+        oskar_atomic_fetch_add(args->counter, 1);
+    return 0;
+}
+
 TEST(thread, create_and_join)
 {
     // Get the number of CPU cores.
@@ -124,3 +156,75 @@ TEST(thread, barriers)
     free(args);
     free(threads);
 }
+
+TEST(thread, atomic_fetch_add)
+{
+    // Set the number of threads and increments per thread.
+    int num_threads = 8;
+    volatile int counter = 0;
+    AtomicArgs args;
+    args.num_loops = 100000;
+    args.counter = &counter;
+
+    // Start all the threads.
+    oskar_Thread** threads = (oskar_Thread**)
+            calloc((size_t) num_threads, sizeof(oskar_Thread*));
+    for (int i = 0; i < num_threads; ++i)
+        threads[i] = oskar_thread_create(thread_atomic, (void*)(&args), 0);
+
+    // Wait for all threads to finish.
+    for (int i = 0; i < num_threads; ++i)
+        oskar_thread_join(threads[i]);
+
+    // Check that no increments were lost.
+    EXPECT_EQ(num_threads * args.num_loops, oskar_atomic_load(&counter));
+    EXPECT_EQ(num_threads * args.num_loops,
+            oskar_atomic_fetch_add(&counter, 1));
+    oskar_atomic_store(&counter, 0);
+    EXPECT_EQ(0, oskar_atomic_load(&counter));
+
+    // Clean up.
+    for (int i = 0; i < num_threads; ++i)
+        oskar_thread_free(threads[i]);
+    free(threads);
+}
+
+TEST(thread, spin_barriers)
+{
+    // Set the number of threads.
+    int num_threads = 4;
+    volatile int counter = 0, errors = 0;
+
+    // Create the shared barrier, and make threads spin before blocking.
+    oskar_Barrier* barrier = oskar_barrier_create(num_threads);
+    oskar_barrier_set_spin_count(barrier, 1000);
+
+    // Allocate thread array and thread arguments for each thread.
+    oskar_Thread** threads = (oskar_Thread**)
+            calloc((size_t) num_threads, sizeof(oskar_Thread*));
+    ThreadArgs* args = (ThreadArgs*)
+            calloc((size_t) num_threads, sizeof(ThreadArgs));
+
+    // Start all the threads.
+    for (int i = 0; i < num_threads; ++i)
+    {
+        args[i].barrier = barrier;
+        args[i].thread_id = i;
+        args[i].counter = &counter;
+        args[i].errors = &errors;
+        threads[i] = oskar_thread_create(thread_spin_barriers,
+                (void*)(&args[i]), 0);
+    }
+
+    // Wait for all threads to finish.
+    for (int i = 0; i < num_threads; ++i)
+        oskar_thread_join(threads[i]);
+    EXPECT_EQ(0, oskar_atomic_load(&errors));
+
+    // Clean up.
+    for (int i = 0; i < num_threads; ++i)
+        oskar_thread_free(threads[i]);
+    oskar_barrier_free(barrier);
+    free(args);
+    free(threads);
+}
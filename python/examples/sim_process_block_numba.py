@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+import time
+import numba
+import numpy
+import oskar
+
+
+@numba.njit(cache=True)
+def accumulate_power(vis, power):
+    """Adds the power in each baseline to the running total.
+
+    The visibility array has dimensions (time, channel, baseline, polarisation)
+    and is a view of the simulator's memory, so no data are copied.
+    This runs in its own thread while the next blocks are being simulated,
+    so it is not parallelised further.
+    """
+    num_times, num_channels, num_baselines, num_pols = vis.shape
+    for b in range(num_baselines):
+        total = 0.0
+        for t in range(num_times):
+            for c in range(num_channels):
+                for p in range(num_pols):
+                    total += abs(vis[t, c, b, p])**2
+        power[b] += total
+
+
+class PowerInterferometer(oskar.Interferometer):
+    """Accumulates the power on each baseline instead of writing files."""
+
+    def __init__(self, precision=None, settings=None):
+        oskar.Interferometer.__init__(self, precision, settings)
+        self.power = None
+
+    def process_block(self, block, block_index):
+        if self.power is None:
+            self.power = numpy.zeros(block.num_baselines)
+        accumulate_power(block.cross_correlations(), self.power)
+
+
+if __name__ == '__main__':
+    # Global options.
+    precision = 'single'
+    phase_centre_ra_deg = 0.0
+    phase_centre_dec_deg = 60.0
+
+    # Define a telescope layout.
+    num_stations = 300
+    numpy.random.seed(1)
+    x = 5000 * numpy.random.randn(num_stations)
+    y = 5000 * numpy.random.randn(num_stations)
+
+    # Set up the sky model.
+    sky = oskar.Sky.generate_grid(phase_centre_ra_deg, phase_centre_dec_deg,
+                                  16, 1.5, precision=precision)
+    sky.append_sources(phase_centre_ra_deg, phase_centre_dec_deg, 1.0)
+
+    # Set up the telescope model.
+    tel = oskar.Telescope(precision)
+    tel.set_channel_bandwidth(1.0e3)
+    tel.set_time_average(10.0)
+    tel.set_pol_mode('Scalar')
+    tel.set_station_coords_enu(longitude_deg=0, latitude_deg=60, altitude_m=0,
+                               x=x, y=y)
+    # Set station properties after stations have been defined.
+    tel.set_phase_centre(phase_centre_ra_deg, phase_centre_dec_deg)
+    tel.set_station_type('Gaussian beam')
+    tel.set_gaussian_station_beam_width(5.0, 100e6)
+
+    # Set up the simulator.
+    simulator = PowerInterferometer(precision)
+    simulator.set_max_sources_per_chunk(500)
+    simulator.set_sky_model(sky)
+    simulator.set_telescope_model(tel)
+    simulator.set_observation_frequency(100e6)
+    simulator.set_observation_time(
+        start_time_mjd_utc=51545.0, length_sec=43200.0, num_time_steps=48)
+
+    # Simulate visibilities and accumulate the power on each baseline.
+    start = time.time()
+    print('Simulating...')
+    simulator.run()
+    print('Completed after %.3f seconds.' % (time.time() - start))
+    print('Mean power per baseline: %.3f' % numpy.mean(simulator.power))
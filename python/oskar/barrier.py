@@ -34,20 +34,46 @@ from __future__ import absolute_import, division
 from threading import Condition
 
 
+class BrokenBarrierError(RuntimeError):
+    """Raised if a thread is waiting on a barrier that has been aborted."""
+    pass
+
+
 # Python 3.2 has a built-in Barrier class.
-# We use this one instead for compatibility with Python 2.x.
+# This one provides the same interface for compatibility with Python 2.x,
+# and is used only if threading.Barrier is not available.
 class Barrier:
-    def __init__(self, num_threads):
+    def __init__(self, num_threads, action=None):
         self.num_threads = num_threads
         self.count = num_threads
         self.iter = 0
+        self.action = action
+        self.broken = False
         self.cond = Condition()
 
+    def abort(self):
+        self.cond.acquire()
+        self.broken = True
+        self.cond.notify_all()
+        self.cond.release()
+
     def wait(self):
         self.cond.acquire()
+        if self.broken:
+            self.cond.release()
+            raise BrokenBarrierError
         i = self.iter
         self.count -= 1
         if self.count == 0:
+            # Call the action (if any) before releasing the other threads.
+            try:
+                if self.action is not None:
+                    self.action()
+            except BaseException:
+                self.broken = True
+                self.cond.notify_all()
+                self.cond.release()
+                raise
             self.iter += 1
             self.count = self.num_threads
             self.cond.notify_all()
@@ -57,7 +83,10 @@ class Barrier:
         # Allow for spurious wake-ups.
         while 1:
             self.cond.wait(None)
-            if i != self.iter:
+            if i != self.iter or self.broken:
                 break
+        broken = (i == self.iter)
         self.cond.release()
+        if broken:
+            raise BrokenBarrierError
         return False
@@ -51,7 +51,7 @@ class ImagingInterferometer(Interferometer):
                 List of OSKAR imagers to use.
             precision (Optional[str]):
                 Either 'double' or 'single' to specify the numerical
-                precision of the simulation. Default 'double'.
+                precision of the simulation. Default 'single'.
             settings (Optional[oskar.SettingsTree]):
                 Optional settings to use to set up the simulator.
         """
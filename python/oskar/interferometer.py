@@ -38,8 +38,16 @@ try:
 except ImportError as e:
     print("Import error: " + str(e))
     _interferometer_lib = None
-from threading import Thread
-from oskar.barrier import Barrier
+import os
+from threading import Event, Lock, Thread
+try:
+    from threading import Barrier, BrokenBarrierError
+except ImportError:
+    from oskar.barrier import Barrier, BrokenBarrierError
+try:
+    from concurrent.futures import ThreadPoolExecutor, wait
+except ImportError:
+    ThreadPoolExecutor = None
 from oskar.vis_block import VisBlock
 from oskar.vis_header import VisHeader
 
@@ -56,7 +64,10 @@ class Interferometer(object):
         Args:
             precision (Optional[str]):
                 Either 'double' or 'single' to specify the numerical
-                precision of the simulation. Default 'double'.
+                precision of the simulation. Default 'single'.
+                Single precision is usually adequate, and is much faster
+                on most GPUs, but the sky and telescope models must use
+                the same precision as the simulator.
             settings (Optional[oskar.SettingsTree]):
                 Optional settings to use to set up the simulator.
         """
@@ -64,11 +75,21 @@ class Interferometer(object):
             raise RuntimeError("OSKAR library not found.")
         self._capsule = None
         self._barrier = None
+        self._block_done = None
+        self._finalise_done = None
+        self._finalised = None
+        self._process_done = None
+        self._vis_blocks = [VisBlock(), VisBlock()]
+        self._vis_header = VisHeader()
+        self._error = None
+        self._lock = Lock()
+        self._pool = None
+        self._pool_size = 0
         self._settings = None
         if precision is not None and settings is not None:
             raise RuntimeError("Specify either precision or all settings.")
         if precision is None:
-            precision = 'double'  # Set default.
+            precision = 'single'  # Set default.
         if settings is not None:
             sim = settings.to_interferometer()
             self._capsule = sim.capsule
@@ -77,6 +98,11 @@ class Interferometer(object):
         self._sky_model_set = False
         self._telescope_model_set = False
 
+    def __del__(self):
+        """Shuts down any threads kept for the simulator."""
+        if getattr(self, '_pool', None) is not None:
+            self._pool.shutdown(wait=False)
+
     def capsule_ensure(self):
         """Ensures the C capsule exists."""
         if self._capsule is None:
@@ -124,10 +150,12 @@ class Interferometer(object):
 
         Returns:
             block (oskar.VisBlock): A handle to the finalised block.
-                This is only valid until the next block is simulated.
+                Output is double-buffered on the host, so this is only
+                valid until block (block_index + 2) is simulated, and the
+                same object will be reused for later blocks.
         """
         self.capsule_ensure()
-        block = VisBlock()
+        block = self._vis_blocks[block_index % 2]
         block.capsule = _interferometer_lib.finalise_block(
             self._capsule, block_index)
         return block
@@ -184,6 +212,11 @@ class Interferometer(object):
         data to any open files. Inherit this class and override this method
         to process the visibilities differently.
 
+        The arrays returned by the block are views of its memory, not copies,
+        so they can be passed directly to compiled code (for example, a
+        function decorated with numba.njit) to keep processing off the
+        critical path. Copy any data that must outlive the call.
+
         Args:
             block (oskar.VisBlock): A handle to the block to be processed.
             block_index (int):      The index of the visibility block.
@@ -218,6 +251,10 @@ class Interferometer(object):
         Call finalise_block() with the same block index to finalise the block
         after calling this method.
 
+        The GIL is released while the block is being simulated (and also
+        while blocks are finalised or written, and in check_init()),
+        so other Python threads can run concurrently.
+
         Args:
             block_index (int): The simulation block index.
             device_id (Optional[int]): The device ID to use for this call.
@@ -232,19 +269,72 @@ class Interferometer(object):
         block, where a handle to the block is supplied as an argument.
         Inherit this class and override process_block() to process the
         visibilities differently.
+
+        The simulation and finalisation of each block are run in C threads
+        without holding the GIL, unless a subclass overrides run_block(),
+        finalise_block() or reset_work_unit_index(), in which case these
+        are called from Python threads instead.
+        Blocks are processed in a separate thread, so that processing of
+        one block overlaps with finalising the next. If neither
+        process_block() nor write_block() is overridden, either by a
+        subclass or by assigning a function to the instance, blocks are
+        written from C without calling back into Python.
         """
         self.capsule_ensure()
         self.check_init()
+
+        # Run the whole pipeline in C unless a subclass needs to be called
+        # for each step.
+        if not (self._is_overridden('run_block') or
+                self._is_overridden('finalise_block') or
+                self._is_overridden('reset_work_unit_index')):
+            # Blocks are written directly by the C pipeline unless a
+            # subclass or the instance processes them differently.
+            callback = None
+            if (self._is_overridden('process_block') or
+                    self._is_overridden('write_block')):
+                callback = self._process_block_capsule
+            _interferometer_lib.run_pipeline(self._capsule, callback)
+            return self.finalise()
+
+        # Otherwise, use Python threads.
         self.reset_work_unit_index()
-        num_threads = self.num_devices + 1
-        self._barrier = Barrier(num_threads)
-        threads = []
-        for i in range(num_threads):
-            threads.append(Thread(target=self._run_blocks, args=[i]))
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        num_blocks = self.num_vis_blocks
+        num_devices = self.num_devices
+        num_threads = num_devices + 2
+        self._barrier = Barrier(num_threads - 2,
+                                action=self.reset_work_unit_index)
+        self._block_done = [Event() for _ in range(num_blocks)]
+        self._finalise_done = [Event() for _ in range(num_blocks)]
+        self._process_done = [Event() for _ in range(num_blocks)]
+        self._finalised = [None, None]
+        self._error = None
+
+        # For N devices, there will be N+2 threads.
+        # Thread 0 is used to finalise the block.
+        # Threads 1 to N (mapped to compute devices) do the simulation.
+        # Thread N+1 is used to process (usually, write) the block.
+        stages = [(self._finalise_blocks, [num_blocks])]
+        for i in range(num_devices):
+            stages.append((self._simulate_blocks, [num_blocks, i]))
+        stages.append((self._process_blocks, [num_blocks]))
+        if ThreadPoolExecutor is not None:
+            # Reuse the same threads for repeated runs.
+            pool = self._get_thread_pool(num_threads)
+            wait([pool.submit(self._run_thread, target, args)
+                  for target, args in stages])
+        else:
+            threads = []
+            for target, args in stages:
+                threads.append(Thread(target=self._run_thread,
+                                      args=[target, args]))
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self._barrier = None  # Its action refers back to this object.
+        if self._error is not None:
+            raise self._error
         return self.finalise()
 
     def set_coords_only(self, value):
@@ -364,13 +454,20 @@ class Interferometer(object):
         self.capsule_ensure()
         _interferometer_lib.set_settings_path(self._capsule, filename)
 
-    def set_sky_model(self, sky_model):
+    def set_sky_model(self, sky_model, max_sources_per_chunk=None):
         """Sets the sky model used for the simulation.
 
+        The sky model is split into chunks when it is set, so any change
+        to the maximum number of sources per chunk must be made first.
+
         Args:
             sky_model (oskar.Sky): Sky model object.
+            max_sources_per_chunk (Optional[int]):
+                If given, the maximum number of sources per chunk to use.
         """
         self.capsule_ensure()
+        if max_sources_per_chunk is not None:
+            self.set_max_sources_per_chunk(max_sources_per_chunk)
         self._sky_model_set = True
         _interferometer_lib.set_sky_model(self._capsule, sky_model.capsule)
 
@@ -392,7 +489,7 @@ class Interferometer(object):
             header (oskar.VisHeader): A handle to the visibility header.
         """
         self.capsule_ensure()
-        header = VisHeader()
+        header = self._vis_header
         header.capsule = _interferometer_lib.vis_header(self._capsule)
         return header
 
@@ -417,39 +514,175 @@ class Interferometer(object):
     num_gpus = property(get_num_gpus)
     num_vis_blocks = property(get_num_vis_blocks)
 
-    def _run_blocks(self, thread_id):
+    def _abort(self, error):
         """
-        Private method to simulate and process visibility blocks concurrently.
+        Private method to stop all threads if an error occurs in one of them.
 
-        Each thread executes this function.
-        For N devices, there will be N+1 threads.
-        Thread 0 is used to finalise the block.
-        Threads 1 to N (mapped to compute devices) do the simulation.
+        All events are set to wake any waiting threads, which then return.
+        The first error is re-raised by run().
 
-        Note that no finalisation is performed on the first iteration (as no
-        data are ready yet), and no simulation is performed for the last
-        iteration (which corresponds to the last block + 1) as this iteration
-        simply finalises the last block.
+        Args:
+            error (Exception): The error to report.
+        """
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._barrier.abort()
+        for event in (self._block_done + self._finalise_done +
+                      self._process_done):
+            event.set()
+
+    def _finalise_blocks(self, num_blocks):
+        """
+        Private method to finalise each block once all devices have run it.
+
+        This runs in thread 0. Blocks are handed from one stage to the next
+        using events, so the next block can be finalised while the previous
+        one is being processed.
 
         Args:
-            thread_id (int): Zero-based thread ID.
+            num_blocks (int): Number of visibility blocks to finalise.
         """
-        # Loop over visibility blocks.
-        num_blocks = self.num_vis_blocks
-        for b in range(num_blocks + 1):
-            # Run simulation in threads 1 to N.
-            if thread_id > 0 and b < num_blocks:
-                self.run_block(b, thread_id - 1)
-
-            # Finalise and process the previous block in thread 0.
-            if thread_id == 0 and b > 0:
-                block = self.finalise_block(b - 1)
-                self.process_block(block, b - 1)
-
-            # Barrier 1: Reset work unit index.
-            self._barrier.wait()
-            if thread_id == 0:
-                self.reset_work_unit_index()
-
-            # Barrier 2: Synchronise before moving to the next block.
-            self._barrier.wait()
+        block_done = self._block_done
+        finalise_done = self._finalise_done
+        finalised = self._finalised
+        finalise_block = self.finalise_block
+        for b in range(num_blocks):
+            block_done[b].wait()
+            if self._error is not None:
+                return
+            finalised[b % 2] = finalise_block(b)
+            finalise_done[b].set()
+
+    def _get_thread_pool(self, num_threads):
+        """
+        Private method to return a pool of exactly the given number of threads.
+
+        The pool is kept for the lifetime of the simulator, and is only
+        replaced if a different number of threads is needed.
+        Every thread must be able to run at once, as they wait for each other.
+
+        Args:
+            num_threads (int): Number of threads required.
+        """
+        if self._pool is not None and self._pool_size != num_threads:
+            self._pool.shutdown()
+            self._pool = None
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=num_threads)
+            self._pool_size = num_threads
+        return self._pool
+
+    def _is_overridden(self, method_name):
+        """
+        Private method to check whether a method has been overridden.
+
+        A method is overridden if it has been assigned on the instance,
+        or redefined by a subclass.
+
+        Args:
+            method_name (str): Name of the method to check.
+        """
+        if method_name in self.__dict__:
+            return True
+        return getattr(type(self), method_name) != \
+            getattr(Interferometer, method_name)
+
+    def _process_block_capsule(self, block_capsule, block_index):
+        """
+        Private method called from the C pipeline to process each block.
+
+        Args:
+            block_capsule (capsule): Capsule holding the finalised block.
+            block_index (int):       The index of the visibility block.
+        """
+        block = self._vis_blocks[block_index % 2]
+        if block.capsule is not block_capsule:
+            block.capsule = block_capsule
+        self.process_block(block, block_index)
+
+    def _process_blocks(self, num_blocks):
+        """
+        Private method to process (usually, write) each finalised block.
+
+        This runs in thread N+1, for N devices, so that processing of one
+        block overlaps with finalising the next.
+
+        Args:
+            num_blocks (int): Number of visibility blocks to process.
+        """
+        finalise_done = self._finalise_done
+        process_done = self._process_done
+        finalised = self._finalised
+        process_block = self.process_block
+        for b in range(num_blocks):
+            finalise_done[b].wait()
+            if self._error is not None:
+                return
+            process_block(finalised[b % 2], b)
+            process_done[b].set()
+
+    def _run_thread(self, target, args):
+        """
+        Private method to run one stage of the pipeline in a thread.
+
+        If the stage fails, all other threads are stopped, and the error
+        is re-raised by run().
+
+        Args:
+            target (callable): The method to run.
+            args (list):       Arguments for the method.
+        """
+        try:
+            target(*args)
+        except BrokenBarrierError:
+            pass
+        except Exception as e:  # pylint: disable=broad-except
+            self._abort(e)
+
+    def _simulate_blocks(self, num_blocks, device_id):
+        """
+        Private method to simulate each block on one compute device.
+
+        This runs in threads 1 to N, for N devices.
+        The device threads can move on to the next block without waiting
+        for the previous one to be finalised. They wait for each other at
+        a barrier, which resets the work unit index once all of them have
+        finished the block.
+
+        Args:
+            num_blocks (int): Number of visibility blocks to simulate.
+            device_id (int):  Zero-based compute device ID.
+        """
+        # Bind the thread to the CPU cores local to its device.
+        # Threads may be reused for other stages in later runs, so restore
+        # the original affinity of the thread afterwards. If it cannot be
+        # restored, leave the thread unbound.
+        affinity = None
+        if hasattr(os, 'sched_getaffinity'):
+            affinity = os.sched_getaffinity(0)
+            _interferometer_lib.bind_thread_to_device(
+                self._capsule, device_id)
+        try:
+            block_done = self._block_done
+            process_done = self._process_done
+            run_block = self.run_block
+            barrier_wait = self._barrier.wait
+            for b in range(num_blocks):
+                # Host output buffers are double-buffered, so block b
+                # cannot be simulated until block b - 2 has been finalised
+                # and processed.
+                if b > 1:
+                    process_done[b - 2].wait()
+                if self._error is not None:
+                    return
+                run_block(b, device_id)
+
+                # The barrier action resets the work unit index before any
+                # device can start the next block.
+                barrier_wait()
+                if device_id == 0:
+                    block_done[b].set()
+        finally:
+            if affinity is not None:
+                os.sched_setaffinity(0, affinity)
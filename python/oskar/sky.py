@@ -51,7 +51,7 @@ class Sky(object):
         Args:
             precision (Optional[str]):
                 Either 'double' or 'single' to specify the numerical
-                precision of the sky model. Default 'double'.
+                precision of the sky model. Default 'single'.
             settings (Optional[oskar.SettingsTree]):
                 Optional settings to use to set up the sky model.
         """
@@ -61,7 +61,7 @@ class Sky(object):
         if precision is not None and settings is not None:
             raise RuntimeError("Specify either precision or all settings.")
         if precision is None:
-            precision = 'double'  # Set default.
+            precision = 'single'  # Set default.
         if settings is not None:
             sky = settings.to_sky()
             self._capsule = sky.capsule
@@ -199,7 +199,7 @@ class Sky(object):
             math.radians(ra0_deg), math.radians(dec0_deg))
 
     @classmethod
-    def from_array(cls, array, precision='double'):
+    def from_array(cls, array, precision='single'):
         """Creates a new sky model from a 2D numpy array.
 
         The format of the array is the same as that in sky model text files.
@@ -230,7 +230,7 @@ class Sky(object):
     def from_fits_file(cls, filename, min_peak_fraction=0.0, min_abs_val=0.0,
                        default_map_units='K', override_units=False,
                        frequency_hz=0.0, spectral_index=-0.7,
-                       precision='double'):
+                       precision='single'):
         """Loads data from a FITS file and returns it as a new sky model.
 
         The file can be either a regular FITS image
@@ -265,7 +265,7 @@ class Sky(object):
     @classmethod
     def generate_grid(cls, ra0_deg, dec0_deg, side_length, fov_deg,
                       mean_flux_jy=1.0, std_flux_jy=0.0, seed=1,
-                      precision='double'):
+                      precision='single'):
         """Generates a grid of sources and returns it as a new sky model.
 
         Args:
@@ -289,7 +289,7 @@ class Sky(object):
 
     @classmethod
     def generate_random_power_law(cls, num_sources, min_flux_jy, max_flux_jy,
-                                  power_law_index, seed=1, precision='double'):
+                                  power_law_index, seed=1, precision='single'):
         """Generates sources scattered randomly over the celestial sphere.
 
         Args:
@@ -319,7 +319,7 @@ class Sky(object):
         return _sky_lib.num_sources(self._capsule)
 
     @classmethod
-    def load(cls, filename, precision='double'):
+    def load(cls, filename, precision='single'):
         """Loads data from a text file and returns it as a new sky model.
 
         Args:
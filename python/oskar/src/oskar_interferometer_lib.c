@@ -29,6 +29,9 @@
 #include <Python.h>
 
 #include <oskar.h>
+#include <utility/oskar_get_num_procs.h>
+#include <utility/oskar_thread.h>
+#include <stdlib.h>
 #include <string.h>
 
 /* http://docs.scipy.org/doc/numpy-dev/reference/c-api.deprecations.html */
@@ -65,6 +68,18 @@ static void interferometer_free(PyObject* capsule)
 }
 
 
+static PyObject* bind_thread_to_device(PyObject* self, PyObject* args)
+{
+    oskar_Interferometer* h = 0;
+    PyObject* capsule = 0;
+    int device_id = 0;
+    if (!PyArg_ParseTuple(args, "Oi", &capsule, &device_id)) return 0;
+    if (!(h = (oskar_Interferometer*) get_handle(capsule, name))) return 0;
+    oskar_interferometer_bind_thread_to_device(h, device_id);
+    return Py_BuildValue("");
+}
+
+
 static PyObject* capsule_name(PyObject* self, PyObject* args)
 {
     PyObject *capsule = 0;
@@ -85,7 +100,10 @@ static PyObject* check_init(PyObject* self, PyObject* args)
     int status = 0;
     if (!PyArg_ParseTuple(args, "O", &capsule)) return 0;
     if (!(h = (oskar_Interferometer*) get_handle(capsule, name))) return 0;
+
+    Py_BEGIN_ALLOW_THREADS
     oskar_interferometer_check_init(h, &status);
+    Py_END_ALLOW_THREADS
 
     /* Check for errors. */
     if (status)
@@ -272,6 +290,216 @@ static PyObject* run(PyObject* self, PyObject* args)
 }
 
 
+struct Pipeline
+{
+    oskar_Interferometer* h;
+    oskar_Barrier* barrier;
+    oskar_Mutex* mutex;
+    oskar_VisBlock* blocks[2];
+    PyObject *block_capsules[2], *callback;
+    PyObject *err_type, *err_value, *err_traceback;
+    int num_devices, num_pending, status, failed;
+};
+typedef struct Pipeline Pipeline;
+
+struct PipelineThreadArgs
+{
+    Pipeline* p;
+    int thread_id;
+};
+typedef struct PipelineThreadArgs PipelineThreadArgs;
+
+static void pipeline_process_block(Pipeline* p, int block_index)
+{
+    PyObject* result = 0;
+    PyGILState_STATE state;
+
+    /* Write the block directly if there is no callback. */
+    if (!p->callback)
+    {
+        oskar_interferometer_write_block(p->h, p->blocks[block_index % 2],
+                block_index, &p->status);
+        return;
+    }
+
+    /* Call the Python function with the GIL held. */
+    state = PyGILState_Ensure();
+    result = PyObject_CallFunction(p->callback, "Oi",
+            p->block_capsules[block_index % 2], block_index);
+
+    /* Store any exception so it can be raised in the calling thread,
+     * and stop the pipeline. */
+    if (!result)
+    {
+        PyErr_Fetch(&p->err_type, &p->err_value, &p->err_traceback);
+        p->failed = 1;
+    }
+    Py_XDECREF(result);
+    PyGILState_Release(state);
+}
+
+static void* pipeline_run_blocks(void* arg)
+{
+    Pipeline* p;
+    oskar_Interferometer* h;
+    int b, thread_id, num_blocks, *status, *failed;
+
+    /* Get thread function arguments. */
+    p = ((PipelineThreadArgs*)arg)->p;
+    thread_id = ((PipelineThreadArgs*)arg)->thread_id;
+    h = p->h;
+    status = &(p->status);
+    failed = &(p->failed);
+
+    /* Thread 0 is used to finalise the block.
+     * Threads 1 to N (mapped to compute devices) do the simulation.
+     * Thread N+1 is used to process the block, by calling back into
+     * Python, or by writing it directly if there is no callback.
+     * The GIL is acquired only when calling back into Python.
+     *
+     * Each finalised block is copied into one of two pipeline-owned
+     * buffers, so that block b - 2 can be processed while block b - 1 is
+     * finalised and block b is simulated.
+     *
+     * The last block is processed by the calling thread once these threads
+     * have finished, as there is nothing left to overlap it with. */
+    if (thread_id > 0 && thread_id <= p->num_devices)
+        oskar_interferometer_bind_thread_to_device(h, thread_id - 1);
+    num_blocks = oskar_interferometer_num_vis_blocks(h);
+    for (b = 0; b < num_blocks + 1; ++b)
+    {
+        if (thread_id > 0 && thread_id <= p->num_devices && b < num_blocks &&
+                !*failed)
+        {
+            int last;
+            oskar_interferometer_run_block(h, b, thread_id - 1, status);
+
+            /* The last device to finish the block resets the work unit
+             * index. No device can start the next block until after the
+             * barrier, so only one barrier is needed per block. */
+            oskar_mutex_lock(p->mutex);
+            last = (--(p->num_pending) == 0);
+            if (last) p->num_pending = p->num_devices;
+            oskar_mutex_unlock(p->mutex);
+            if (last)
+                oskar_interferometer_reset_work_unit_index(h);
+        }
+        if (thread_id == 0 && b > 0 && b <= num_blocks && !*failed)
+        {
+            oskar_VisBlock* block;
+            block = oskar_interferometer_finalise_block(h, b - 1, status);
+            oskar_vis_block_copy(p->blocks[(b - 1) % 2], block, status);
+        }
+        if (thread_id > p->num_devices && b > 1 && !*status && !*failed)
+            pipeline_process_block(p, b - 2);
+
+        /* Synchronise before moving to the next block. */
+        oskar_barrier_wait(p->barrier);
+    }
+    return 0;
+}
+
+static PyObject* run_pipeline(PyObject* self, PyObject* args)
+{
+    Pipeline p;
+    PipelineThreadArgs* thread_args = 0;
+    oskar_Thread** threads = 0;
+    PyObject* capsule = 0;
+    int i, num_blocks, num_threads, free_status = 0;
+    if (!PyArg_ParseTuple(args, "OO", &capsule, &p.callback)) return 0;
+    if (!(p.h = (oskar_Interferometer*) get_handle(capsule, name))) return 0;
+    if (p.callback == Py_None)
+        p.callback = 0;
+    else if (!PyCallable_Check(p.callback))
+    {
+        PyErr_SetString(PyExc_TypeError, "Callback is not callable.");
+        return 0;
+    }
+    if (!oskar_interferometer_vis_header(p.h))
+    {
+        PyErr_SetString(PyExc_RuntimeError,
+                "Simulator not initialised. Call check_init() first.");
+        return 0;
+    }
+#if PY_VERSION_HEX < 0x03070000
+    PyEval_InitThreads();
+#endif
+
+    /* Set up the threads. */
+    p.status = 0;
+    p.failed = 0;
+    p.err_type = p.err_value = p.err_traceback = 0;
+    p.num_devices = oskar_interferometer_num_devices(p.h);
+    p.num_pending = p.num_devices;
+    num_blocks = oskar_interferometer_num_vis_blocks(p.h);
+    num_threads = p.num_devices + 2;
+    p.barrier = oskar_barrier_create(num_threads);
+    p.mutex = oskar_mutex_create();
+
+    /* If blocks are likely to be very short, poll the barrier before
+     * blocking on it to reduce wake-up latency, as long as each thread
+     * can have its own core. */
+    if ((oskar_interferometer_coords_only(p.h) || num_blocks > 1000) &&
+            num_threads <= oskar_get_num_procs())
+        oskar_barrier_set_spin_count(p.barrier, 10000);
+    for (i = 0; i < 2; ++i)
+    {
+        p.blocks[i] = oskar_vis_block_create_from_header(OSKAR_CPU,
+                oskar_interferometer_vis_header(p.h), &p.status);
+        p.block_capsules[i] = p.blocks[i] ?
+                PyCapsule_New((void*)p.blocks[i], "oskar_VisBlock", NULL) : 0;
+        if (!p.block_capsules[i] && !p.status)
+            p.status = OSKAR_ERR_MEMORY_ALLOC_FAILURE;
+    }
+    threads = (oskar_Thread**) calloc(num_threads, sizeof(oskar_Thread*));
+    thread_args = (PipelineThreadArgs*)
+            calloc(num_threads, sizeof(PipelineThreadArgs));
+
+    /* Run the pipeline without holding the GIL. */
+    Py_BEGIN_ALLOW_THREADS
+    oskar_interferometer_reset_work_unit_index(p.h);
+    for (i = 0; i < num_threads; ++i)
+    {
+        thread_args[i].p = &p;
+        thread_args[i].thread_id = i;
+        threads[i] = oskar_thread_create(pipeline_run_blocks,
+                (void*)&thread_args[i], 0);
+    }
+    for (i = 0; i < num_threads; ++i)
+    {
+        oskar_thread_join(threads[i]);
+        oskar_thread_free(threads[i]);
+    }
+    if (num_blocks > 0 && !p.status && !p.failed)
+        pipeline_process_block(&p, num_blocks - 1);
+    Py_END_ALLOW_THREADS
+    oskar_barrier_free(p.barrier);
+    oskar_mutex_free(p.mutex);
+    for (i = 0; i < 2; ++i)
+    {
+        Py_XDECREF(p.block_capsules[i]);
+        oskar_vis_block_free(p.blocks[i], &free_status);
+    }
+    free(thread_args);
+    free(threads);
+
+    /* Check for errors. */
+    if (p.err_type)
+    {
+        PyErr_Restore(p.err_type, p.err_value, p.err_traceback);
+        return 0;
+    }
+    if (p.status)
+    {
+        PyErr_Format(PyExc_RuntimeError,
+                "run_pipeline() failed with code %d (%s).",
+                p.status, oskar_get_error_string(p.status));
+        return 0;
+    }
+    return Py_BuildValue("");
+}
+
+
 static PyObject* set_coords_only(PyObject* self, PyObject* args)
 {
     oskar_Interferometer* h = 0;
@@ -600,6 +828,8 @@ static PyObject* write_block(PyObject* self, PyObject* args)
 /* Method table. */
 static PyMethodDef methods[] =
 {
+        {"bind_thread_to_device", (PyCFunction)bind_thread_to_device,
+                METH_VARARGS, "bind_thread_to_device(device_id)"},
         {"capsule_name", (PyCFunction)capsule_name,
                 METH_VARARGS, "capsule_name()"},
         {"check_init", (PyCFunction)check_init, METH_VARARGS, "check_init()"},
@@ -621,6 +851,8 @@ static PyMethodDef methods[] =
         {"run_block", (PyCFunction)run_block,
                 METH_VARARGS, "run_block(block_index, gpu_id)"},
         {"run", (PyCFunction)run, METH_VARARGS, "run()"},
+        {"run_pipeline", (PyCFunction)run_pipeline,
+                METH_VARARGS, "run_pipeline(callback)"},
         {"set_coords_only", (PyCFunction)set_coords_only,
                 METH_VARARGS, "set_coords_only(value)"},
         {"set_correlation_type", (PyCFunction)set_correlation_type,
@@ -52,7 +52,7 @@ class Telescope(object):
         Args:
             precision (Optional[str]):
                 Either 'double' or 'single' to specify the numerical
-                precision of the data. Default 'double'.
+                precision of the data. Default 'single'.
             settings (Optional[oskar.SettingsTree]):
                 Optional settings to use to set up the telescope model.
         """
@@ -62,7 +62,7 @@ class Telescope(object):
         if precision is not None and settings is not None:
             raise RuntimeError("Specify either precision or all settings.")
         if precision is None:
-            precision = 'double'  # Set default.
+            precision = 'single'  # Set default.
         if settings is not None:
             tel = settings.to_telescope()
             self._capsule = tel.capsule
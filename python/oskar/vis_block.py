@@ -50,7 +50,11 @@ class VisBlock(object):
         self._capsule = None
 
     def auto_correlations(self):
-        """Returns an array reference to the auto correlations."""
+        """Returns an array reference to the auto correlations.
+
+        The array is a view of the block's memory, with dimensions
+        (time, channel, station, polarisation).
+        """
         self.capsule_ensure()
         return _vis_block_lib.auto_correlations(self._capsule)
 
@@ -92,7 +96,11 @@ class VisBlock(object):
             raise RuntimeError("Capsule is not of type oskar_VisBlock.")
 
     def cross_correlations(self):
-        """Returns an array reference to the cross correlations."""
+        """Returns an array reference to the cross correlations.
+
+        The array is a view of the block's memory, with dimensions
+        (time, channel, baseline, polarisation).
+        """
         self.capsule_ensure()
         return _vis_block_lib.cross_correlations(self._capsule)
 